@@ -101,6 +101,10 @@ if PY2:
     def load_python_module(name, pathname):
         return imp.load_source(name, pathname)
 
+    def intern_string(value):
+        # unicode objects can not be interned in Python 2
+        return intern(value) if isinstance(value, str) else value
+
 
 else:
     import importlib.util
@@ -134,3 +138,6 @@ else:
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         return module
+
+    def intern_string(value):
+        return sys.intern(value)
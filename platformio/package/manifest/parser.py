@@ -12,24 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import inspect
 import io
 import json
 import os
 import re
 import tarfile
+from collections import OrderedDict
 
 import requests
 
 from platformio import util
-from platformio.compat import get_object_members, string_types
+from platformio.compat import get_object_members, intern_string, string_types
 from platformio.package.exception import ManifestParserError, UnknownManifestError
 from platformio.project.helpers import is_platformio_project
 
 try:
-    from urllib.parse import urlparse
+    from urllib.parse import urlparse, urlsplit
 except ImportError:
-    from urlparse import urlparse
+    from urlparse import urlparse, urlsplit
 
 
 class ManifestFileType(object):
@@ -133,23 +133,26 @@ class ManifestParserFactory(object):
     def new(  # pylint: disable=redefined-builtin
         contents, type, remote_url=None, package_dir=None
     ):
-        for _, cls in globals().items():
-            if (
-                inspect.isclass(cls)
-                and issubclass(cls, BaseManifestParser)
-                and cls != BaseManifestParser
-                and cls.manifest_type == type
-            ):
-                return cls(contents, remote_url, package_dir)
-        raise UnknownManifestError("Unknown manifest file type %s" % type)
+        if type not in MANIFEST_PARSERS:
+            raise UnknownManifestError("Unknown manifest file type %s" % type)
+        return MANIFEST_PARSERS[type](contents, remote_url, package_dir)
 
 
 class BaseManifestParser(object):
+    manifest_type = None
+
+    AUTHOR_EMAIL_RE = re.compile(r"^([^<]*)<([^>]*)>")
+    EMAIL_AT_RE = re.compile(r"\s+[aA][tT]\s+")
+    EXAMPLE_NAME_RE = re.compile(r"[^a-z\d\d\-\_/]+", re.I)
+
+    PARSED_CACHE_SIZE = 256
+    _parsed_cache = OrderedDict()
+
     def __init__(self, contents, remote_url=None, package_dir=None):
         self.remote_url = remote_url
         self.package_dir = package_dir
         try:
-            self._data = self.parse(contents)
+            self._data = self.parse_cached(contents)
         except Exception as e:
             raise ManifestParserError("Could not parse manifest -> %s" % e)
 
@@ -157,36 +160,78 @@ class BaseManifestParser(object):
         self._data = self.parse_examples(self._data)
 
         # remove None fields
-        for key in list(self._data.keys()):
-            if self._data[key] is None:
-                del self._data[key]
+        self._data = {
+            intern_string(key): value
+            for key, value in self._data.items()
+            if value is not None
+        }
+        self._data = self.intern_common_values(self._data)
 
     def parse(self, contents):
         raise NotImplementedError
 
+    def parse_cached(self, contents):
+        if not isinstance(contents, string_types):
+            return self.parse(contents)
+        # the same manifest is parsed many times per session (package managers,
+        # library builder), so reuse the raw data of previously parsed contents
+        key = (type(self), self.remote_url, contents)
+        cache = BaseManifestParser._parsed_cache
+        data = cache.pop(key, None)
+        if data is None:
+            data = self.parse(contents)
+            if len(cache) >= self.PARSED_CACHE_SIZE:
+                cache.popitem(last=False)
+        # (re)insert as the most recently used entry
+        cache[key] = data
+        # a caller is free to modify the result
+        return self.copy_data(data)
+
     def as_dict(self):
         return self._data
 
+    @classmethod
+    def copy_data(cls, data):
+        # parsed data consists of JSON types only, so copy mutable containers
+        # and share immutable values instead of using a generic deep copy
+        if isinstance(data, dict):
+            return {key: cls.copy_data(value) for key, value in data.items()}
+        if isinstance(data, list):
+            return [cls.copy_data(item) for item in data]
+        return data
+
+    @staticmethod
+    def intern_common_values(data):
+        # the same platform, framework and license names recur across manifests
+        for key in ("platforms", "frameworks"):
+            if isinstance(data.get(key), list):
+                data[key] = [
+                    intern_string(item) if isinstance(item, string_types) else item
+                    for item in data[key]
+                ]
+        if isinstance(data.get("license"), string_types):
+            data["license"] = intern_string(data["license"])
+        return data
+
     @staticmethod
     def str_to_list(value, sep=",", lowercase=True):
         if isinstance(value, string_types):
+            # lowercase the whole string once instead of every item
+            if lowercase:
+                value = value.lower()
             value = value.split(sep)
-        assert isinstance(value, list)
-        result = []
-        for item in value:
-            item = item.strip()
-            if not item:
-                continue
+        else:
+            assert isinstance(value, list)
             if lowercase:
-                item = item.lower()
-            result.append(item)
-        return result
+                value = [item.lower() for item in value]
+        value = [item.strip() for item in value]
+        return [item for item in value if item]
 
-    @staticmethod
-    def cleanup_author(author):
+    @classmethod
+    def cleanup_author(cls, author):
         assert isinstance(author, dict)
         if author.get("email"):
-            author["email"] = re.sub(r"\s+[aA][tT]\s+", "@", author["email"])
+            author["email"] = cls.EMAIL_AT_RE.sub("@", author["email"])
             if "@" not in author["email"]:
                 author["email"] = None
         for key in list(author.keys()):
@@ -194,17 +239,15 @@ class BaseManifestParser(object):
                 del author[key]
         return author
 
-    @staticmethod
-    def parse_author_name_and_email(raw):
+    @classmethod
+    def parse_author_name_and_email(cls, raw):
         if raw == "None" or "://" in raw:
             return (None, None)
         name = raw
         email = None
-        ldel = "<"
-        rdel = ">"
-        if ldel in raw and rdel in raw:
-            name = raw[: raw.index(ldel)]
-            email = raw[raw.index(ldel) + 1 : raw.index(rdel)]
+        match = cls.AUTHOR_EMAIL_RE.match(raw)
+        if match:
+            name, email = match.groups()
         if "(" in name:
             name = name.split("(")[0]
         return (name.strip(), email.strip() if email else None)
@@ -239,8 +282,8 @@ class BaseManifestParser(object):
             del data["examples"]
         return data
 
-    @staticmethod
-    def parse_examples_from_dir(package_dir):
+    @classmethod
+    def parse_examples_from_dir(cls, package_dir):
         assert os.path.isdir(package_dir)
         examples_dir = os.path.join(package_dir, "examples")
         if not os.path.isdir(examples_dir):
@@ -309,13 +352,14 @@ class BaseManifestParser(object):
         # normalize example names
         for item in result:
             item["name"] = item["name"].replace(os.path.sep, "/")
-            item["name"] = re.sub(r"[^a-z\d\d\-\_/]+", "_", item["name"], flags=re.I)
+            item["name"] = cls.EXAMPLE_NAME_RE.sub("_", item["name"])
 
         return result or None
 
 
 class LibraryJsonManifestParser(BaseManifestParser):
     manifest_type = ManifestFileType.LIBRARY_JSON
+    RENAMED_PLATFORMS = {"espressif": "espressif8266"}
 
     def parse(self, contents):
         data = json.loads(contents)
@@ -361,16 +405,10 @@ class LibraryJsonManifestParser(BaseManifestParser):
             raw = [raw]
         return [self.cleanup_author(author) for author in raw]
 
-    @staticmethod
-    def _parse_platforms(raw):
+    @classmethod
+    def _parse_platforms(cls, raw):
         assert isinstance(raw, list)
-        result = []
-        # renamed platforms
-        for item in raw:
-            if item == "espressif":
-                item = "espressif8266"
-            result.append(item)
-        return result
+        return [cls.RENAMED_PLATFORMS.get(item, item) for item in raw]
 
     @staticmethod
     def _parse_export(raw):
@@ -408,12 +446,13 @@ class LibraryJsonManifestParser(BaseManifestParser):
 
 class ModuleJsonManifestParser(BaseManifestParser):
     manifest_type = ManifestFileType.MODULE_JSON
+    DEFAULT_EXPORT_EXCLUDE = ("tests", "test", "*.doxyfile", "*.pdf")
 
     def parse(self, contents):
         data = json.loads(contents)
         data["frameworks"] = ["mbed"]
         data["platforms"] = ["*"]
-        data["export"] = {"exclude": ["tests", "test", "*.doxyfile", "*.pdf"]}
+        data["export"] = {"exclude": list(self.DEFAULT_EXPORT_EXCLUDE)}
         if "author" in data:
             data["authors"] = self._parse_authors(data.get("author"))
             del data["author"]
@@ -455,10 +494,22 @@ class ModuleJsonManifestParser(BaseManifestParser):
 
 class LibraryPropertiesManifestParser(BaseManifestParser):
     manifest_type = ManifestFileType.LIBRARY_PROPERTIES
+    KEYWORDS_SEP_RE = re.compile(r"[\s/]+")
+    DEFAULT_EXPORT_EXCLUDE = ("extras", "docs", "tests", "test", "*.doxyfile", "*.pdf")
+    ARCHITECTURES_MAP = {
+        "avr": "atmelavr",
+        "sam": "atmelsam",
+        "samd": "atmelsam",
+        "esp8266": "espressif8266",
+        "esp32": "espressif32",
+        "arc32": "intel_arc32",
+        "stm32": "ststm32",
+    }
 
     def parse(self, contents):
         data = self._parse_properties(contents)
-        repository = self._parse_repository(data)
+        remote_url_attrs = self._split_remote_url()
+        repository = self._parse_repository(data, remote_url_attrs)
         homepage = data.get("url") or None
         if repository and repository["url"] == homepage:
             homepage = None
@@ -470,7 +521,7 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
                 description=self._parse_description(data),
                 platforms=self._parse_platforms(data) or ["*"],
                 keywords=self._parse_keywords(data),
-                export=self._parse_export(),
+                export=self._parse_export(remote_url_attrs),
             )
         )
         if "author" in data:
@@ -486,16 +537,15 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
     def _parse_properties(contents):
         data = {}
         for line in contents.splitlines():
-            line = line.strip()
-            if not line or "=" not in line:
-                continue
-            # skip comments
-            if line.startswith("#"):
+            key, sep, value = line.partition("=")
+            if not sep:
                 continue
-            key, value = line.split("=", 1)
-            if not value.strip():
+            key = key.strip()
+            value = value.strip()
+            # skip comments and empty fields
+            if not value or key.startswith("#"):
                 continue
-            data[key.strip()] = value.strip()
+            data[key] = value
         return data
 
     @staticmethod
@@ -508,28 +558,19 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
             lines[0] += "."
         return " ".join(lines)
 
-    @staticmethod
-    def _parse_keywords(properties):
-        result = []
-        for item in re.split(r"[\s/]+", properties.get("category", "uncategorized")):
-            item = item.strip()
-            if not item:
-                continue
-            result.append(item.lower())
-        return result
+    @classmethod
+    def _parse_keywords(cls, properties):
+        return [
+            item.lower()
+            for item in cls.KEYWORDS_SEP_RE.split(
+                properties.get("category", "uncategorized")
+            )
+            if item
+        ]
 
-    @staticmethod
-    def _parse_platforms(properties):
+    @classmethod
+    def _parse_platforms(cls, properties):
         result = []
-        platforms_map = {
-            "avr": "atmelavr",
-            "sam": "atmelsam",
-            "samd": "atmelsam",
-            "esp8266": "espressif8266",
-            "esp32": "espressif32",
-            "arc32": "intel_arc32",
-            "stm32": "ststm32",
-        }
         for arch in properties.get("architectures", "").split(","):
             if "particle-" in arch:
                 raise ManifestParserError("Particle is not supported yet")
@@ -538,8 +579,8 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
                 continue
             if arch == "*":
                 return ["*"]
-            if arch in platforms_map:
-                result.append(platforms_map[arch])
+            if arch in cls.ARCHITECTURES_MAP:
+                result.append(cls.ARCHITECTURES_MAP[arch])
         return result
 
     def _parse_authors(self, properties):
@@ -569,11 +610,18 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
                 )
         return authors
 
-    def _parse_repository(self, properties):
-        if self.remote_url:
-            url_attrs = urlparse(self.remote_url)
-            repo_path_tokens = url_attrs.path[1:].split("/")[:-1]
-            if "github" in url_attrs.netloc:
+    def _split_remote_url(self):
+        if not self.remote_url:
+            return None
+        url_attrs = urlsplit(self.remote_url)
+        # host name and repository path without the manifest file name
+        return (url_attrs.netloc, url_attrs.path[1:].split("/")[:-1])
+
+    @staticmethod
+    def _parse_repository(properties, remote_url_attrs):
+        if remote_url_attrs:
+            netloc, repo_path_tokens = remote_url_attrs
+            if "github" in netloc:
                 return dict(
                     type="git",
                     url="https://github.com/" + "/".join(repo_path_tokens[:2]),
@@ -583,7 +631,7 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
                     type="git",
                     url="https://%s/%s"
                     % (
-                        url_attrs.netloc,
+                        netloc,
                         "/".join(repo_path_tokens[: repo_path_tokens.index("raw")]),
                     ),
                 )
@@ -591,13 +639,12 @@ class LibraryPropertiesManifestParser(BaseManifestParser):
             return dict(type="git", url=properties["url"])
         return None
 
-    def _parse_export(self):
-        result = {"exclude": ["extras", "docs", "tests", "test", "*.doxyfile", "*.pdf"]}
+    def _parse_export(self, remote_url_attrs):
+        result = {"exclude": list(self.DEFAULT_EXPORT_EXCLUDE)}
         include = None
-        if self.remote_url:
-            url_attrs = urlparse(self.remote_url)
-            repo_path_tokens = url_attrs.path[1:].split("/")[:-1]
-            if "github" in url_attrs.netloc:
+        if remote_url_attrs:
+            netloc, repo_path_tokens = remote_url_attrs
+            if "github" in netloc:
                 include = "/".join(repo_path_tokens[3:]) or None
             elif "raw" in repo_path_tokens:
                 include = (
@@ -684,3 +731,15 @@ class PackageJsonManifestParser(BaseManifestParser):
             data["homepage"] = data["url"]
             del data["url"]
         return data
+
+
+MANIFEST_PARSERS = {
+    cls.manifest_type: cls
+    for cls in (
+        PlatformJsonManifestParser,
+        LibraryJsonManifestParser,
+        LibraryPropertiesManifestParser,
+        ModuleJsonManifestParser,
+        PackageJsonManifestParser,
+    )
+}
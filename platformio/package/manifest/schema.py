@@ -14,6 +14,8 @@
 
 # pylint: disable=too-many-ancestors
 
+import string
+
 import marshmallow
 import requests
 import semantic_version
@@ -83,6 +85,13 @@ class StrictListField(fields.List):
             raise exc
 
 
+# platform and framework names share the same constraints
+PLATFORM_NAME_VALIDATORS = (
+    validate.Length(min=1, max=50),
+    validate.Regexp(r"^([a-z\d\-_]+|\*)$", error="Only [a-z0-9-_*] chars are allowed"),
+)
+
+
 class AuthorSchema(StrictSchema):
     name = fields.Str(required=True, validate=validate.Length(min=1, max=50))
     email = fields.Email(validate=validate.Length(min=1, max=50))
@@ -106,26 +115,8 @@ class DependencySchema(StrictSchema):
     name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     version = fields.Str(validate=validate.Length(min=1, max=100))
     authors = StrictListField(fields.Str(validate=validate.Length(min=1, max=50)))
-    platforms = StrictListField(
-        fields.Str(
-            validate=[
-                validate.Length(min=1, max=50),
-                validate.Regexp(
-                    r"^([a-z\d\-_]+|\*)$", error="Only [a-z0-9-_*] chars are allowed"
-                ),
-            ]
-        )
-    )
-    frameworks = StrictListField(
-        fields.Str(
-            validate=[
-                validate.Length(min=1, max=50),
-                validate.Regexp(
-                    r"^([a-z\d\-_]+|\*)$", error="Only [a-z0-9-_*] chars are allowed"
-                ),
-            ]
-        )
-    )
+    platforms = StrictListField(fields.Str(validate=PLATFORM_NAME_VALIDATORS))
+    frameworks = StrictListField(fields.Str(validate=PLATFORM_NAME_VALIDATORS))
 
 
 class ExportSchema(BaseSchema):
@@ -184,26 +175,8 @@ class ManifestSchema(BaseSchema):
             ]
         )
     )
-    platforms = StrictListField(
-        fields.Str(
-            validate=[
-                validate.Length(min=1, max=50),
-                validate.Regexp(
-                    r"^([a-z\d\-_]+|\*)$", error="Only [a-z0-9-_*] chars are allowed"
-                ),
-            ]
-        )
-    )
-    frameworks = StrictListField(
-        fields.Str(
-            validate=[
-                validate.Length(min=1, max=50),
-                validate.Regexp(
-                    r"^([a-z\d\-_]+|\*)$", error="Only [a-z0-9-_*] chars are allowed"
-                ),
-            ]
-        )
-    )
+    platforms = StrictListField(fields.Str(validate=PLATFORM_NAME_VALIDATORS))
+    frameworks = StrictListField(fields.Str(validate=PLATFORM_NAME_VALIDATORS))
 
     # platform.json specific
     title = fields.Str(validate=validate.Length(min=1, max=100))
@@ -225,6 +198,10 @@ class ManifestSchema(BaseSchema):
         try:
             value = str(value)
             assert "." in value
+            # skip the regex based parser for plain "major.minor.patch" versions
+            parts = value.split(".")
+            if len(parts) == 3 and all(p and not p.strip(string.digits) for p in parts):
+                return
             semantic_version.Version.coerce(value)
         except (AssertionError, ValueError):
             raise ValidationError(
@@ -234,12 +211,11 @@ class ManifestSchema(BaseSchema):
     @validates("license")
     def validate_license(self, value):
         try:
-            spdx = self.load_spdx_licenses()
+            license_ids = self.load_spdx_license_ids()
         except requests.exceptions.RequestException:
             raise ValidationError("Could not load SPDX licenses for validation")
-        for item in spdx.get("licenses", []):
-            if item.get("licenseId") == value:
-                return
+        if value in license_ids:
+            return
         raise ValidationError(
             "Invalid SPDX license identifier. See valid identifiers at "
             "https://spdx.org/licenses/"
@@ -254,3 +230,11 @@ class ManifestSchema(BaseSchema):
         )
         r.raise_for_status()
         return r.json()
+
+    @staticmethod
+    @memoized(expire="1h")
+    def load_spdx_license_ids():
+        return frozenset(
+            item.get("licenseId")
+            for item in ManifestSchema.load_spdx_licenses().get("licenses", [])
+        )
@@ -56,6 +56,8 @@ class PackageType(object):
 
 
 class PackageSpec(object):
+    __slots__ = ("ownername", "id", "name", "requirements", "url")
+
     def __init__(  # pylint: disable=redefined-builtin,too-many-arguments
         self, raw=None, ownername=None, id=None, name=None, requirements=None, url=None
     ):
@@ -80,15 +82,18 @@ class PackageSpec(object):
         )
 
     def __eq__(self, other):
-        return all(
-            [
-                self.ownername == other.ownername,
-                self.id == other.id,
-                self.name == other.name,
-                self.requirements == other.requirements,
-                self.url == other.url,
-            ]
-        )
+        if not isinstance(other, PackageSpec):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def as_tuple(self):
+        return (self.ownername, self.id, self.name, self.requirements, self.url)
 
     def _parse(self, raw):
         if raw is None:
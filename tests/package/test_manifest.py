@@ -15,14 +15,23 @@
 import os
 import re
 import tarfile
+from collections import OrderedDict
 
-import jsondiff
 import pytest
 
 from platformio.compat import WINDOWS
 from platformio.package.manifest import parser
 from platformio.package.manifest.schema import ManifestSchema, ManifestValidationError
 
+LIBRARY_PROPERTIES_EXPORT_EXCLUDE = [
+    "extras",
+    "docs",
+    "tests",
+    "test",
+    "*.doxyfile",
+    "*.pdf",
+]
+
 
 def test_library_json_parser():
     contents = """
@@ -51,27 +60,21 @@ def test_library_json_parser():
 """
     raw_data = parser.LibraryJsonManifestParser(contents).as_dict()
     raw_data["dependencies"] = sorted(raw_data["dependencies"], key=lambda a: a["name"])
-    assert not jsondiff.diff(
-        raw_data,
-        {
-            "name": "TestPackage",
-            "platforms": ["atmelavr", "espressif8266"],
-            "repository": {
-                "type": "git",
-                "url": "https://github.com/username/repo.git",
-            },
-            "export": {"exclude": [".gitignore", "tests"], "include": ["mylib"]},
-            "keywords": ["kw1", "kw2", "kw3"],
-            "homepage": "http://old.url.format",
-            "build": {"flags": ["-DHELLO"]},
-            "dependencies": [
-                {"name": "@owner/deps3", "version": "^2.1.3"},
-                {"name": "deps1", "version": "1.2.0"},
-                {"name": "deps2", "version": "https://github.com/username/package.git"},
-            ],
-            "customField": "Custom Value",
-        },
-    )
+    assert raw_data == {
+        "name": "TestPackage",
+        "platforms": ["atmelavr", "espressif8266"],
+        "repository": {"type": "git", "url": "https://github.com/username/repo.git"},
+        "export": {"exclude": [".gitignore", "tests"], "include": ["mylib"]},
+        "keywords": ["kw1", "kw2", "kw3"],
+        "homepage": "http://old.url.format",
+        "build": {"flags": ["-DHELLO"]},
+        "dependencies": [
+            {"name": "@owner/deps3", "version": "^2.1.3"},
+            {"name": "deps1", "version": "1.2.0"},
+            {"name": "deps2", "version": "https://github.com/username/package.git"},
+        ],
+        "customField": "Custom Value",
+    }
 
     contents = """
 {
@@ -90,50 +93,46 @@ def test_library_json_parser():
 """
     raw_data = parser.LibraryJsonManifestParser(contents).as_dict()
     raw_data["dependencies"] = sorted(raw_data["dependencies"], key=lambda a: a["name"])
-    assert not jsondiff.diff(
-        raw_data,
-        {
-            "keywords": ["sound", "audio", "music", "sd", "card", "playback"],
-            "frameworks": ["arduino"],
-            "export": {"exclude": ["audio_samples"]},
-            "platforms": ["atmelavr"],
-            "dependencies": [
-                {
-                    "name": "@owner/deps2",
-                    "version": "1.0.0",
-                    "platforms": ["*"],
-                    "frameworks": ["arduino", "espidf"],
-                },
-                {"name": "deps1", "version": "1.0.0"},
-                {
-                    "name": "deps3",
-                    "version": "1.0.0",
-                    "platforms": ["ststm32", "sifive"],
-                },
-            ],
-        },
-    )
+    assert raw_data == {
+        "keywords": ["sound", "audio", "music", "sd", "card", "playback"],
+        "frameworks": ["arduino"],
+        "export": {"exclude": ["audio_samples"]},
+        "platforms": ["atmelavr"],
+        "dependencies": [
+            {
+                "name": "@owner/deps2",
+                "version": "1.0.0",
+                "platforms": ["*"],
+                "frameworks": ["arduino", "espidf"],
+            },
+            {"name": "deps1", "version": "1.0.0"},
+            {"name": "deps3", "version": "1.0.0", "platforms": ["ststm32", "sifive"]},
+        ],
+    }
 
     raw_data = parser.LibraryJsonManifestParser(
         '{"dependencies": ["dep1", "dep2", "@owner/dep3"]}'
     ).as_dict()
     raw_data["dependencies"] = sorted(raw_data["dependencies"], key=lambda a: a["name"])
-    assert not jsondiff.diff(
-        raw_data,
-        {
-            "dependencies": [
-                {"name": "@owner/dep3"},
-                {"name": "dep1"},
-                {"name": "dep2"},
-            ],
-        },
-    )
+    assert raw_data == {
+        "dependencies": [{"name": "@owner/dep3"}, {"name": "dep1"}, {"name": "dep2"}],
+    }
 
     # broken dependencies
     with pytest.raises(parser.ManifestParserError):
         parser.LibraryJsonManifestParser({"dependencies": ["deps1", "deps2"]})
 
 
+def test_json_parser_decoding():
+    data = parser.LibraryJsonManifestParser(
+        '{"name": "TestPackage", "bigInt": 123456789012345678901234567890, '
+        '"nan": NaN, "surrogate": "\\ud800"}'
+    ).as_dict()
+    assert data["bigInt"] == 123456789012345678901234567890
+    assert data["nan"] != data["nan"]
+    assert data["surrogate"] == u"\ud800"
+
+
 def test_module_json_parser():
     contents = """
 {
@@ -166,31 +165,28 @@ def test_module_json_parser():
 
     raw_data = parser.ModuleJsonManifestParser(contents).as_dict()
     raw_data["dependencies"] = sorted(raw_data["dependencies"], key=lambda a: a["name"])
-    assert not jsondiff.diff(
-        raw_data,
-        {
-            "name": "YottaLibrary",
-            "description": "This is Yotta library",
-            "homepage": "https://yottabuild.org",
-            "keywords": ["mbed", "yotta"],
-            "license": "Apache-2.0",
-            "platforms": ["*"],
-            "frameworks": ["mbed"],
-            "export": {"exclude": ["tests", "test", "*.doxyfile", "*.pdf"]},
-            "authors": [{"email": "name@surname.com", "name": "Name Surname"}],
-            "version": "1.2.3",
-            "repository": {"type": "git", "url": "git@github.com:username/repo.git"},
-            "dependencies": [
-                {
-                    "name": "simplelog",
-                    "version": "ARMmbed/simplelog#~0.0.1",
-                    "frameworks": ["mbed"],
-                },
-                {"name": "usefulmodule", "version": "^1.2.3", "frameworks": ["mbed"]},
-            ],
-            "customField": "Custom Value",
-        },
-    )
+    assert raw_data == {
+        "name": "YottaLibrary",
+        "description": "This is Yotta library",
+        "homepage": "https://yottabuild.org",
+        "keywords": ["mbed", "yotta"],
+        "license": "Apache-2.0",
+        "platforms": ["*"],
+        "frameworks": ["mbed"],
+        "export": {"exclude": ["tests", "test", "*.doxyfile", "*.pdf"]},
+        "authors": [{"email": "name@surname.com", "name": "Name Surname"}],
+        "version": "1.2.3",
+        "repository": {"type": "git", "url": "git@github.com:username/repo.git"},
+        "dependencies": [
+            {
+                "name": "simplelog",
+                "version": "ARMmbed/simplelog#~0.0.1",
+                "frameworks": ["mbed"],
+            },
+            {"name": "usefulmodule", "version": "^1.2.3", "frameworks": ["mbed"]},
+        ],
+        "customField": "Custom Value",
+    }
 
 
 def test_library_properties_parser():
@@ -207,52 +203,31 @@ ignore_empty_field=
 """
     raw_data = parser.LibraryPropertiesManifestParser(contents).as_dict()
     raw_data["dependencies"] = sorted(raw_data["dependencies"], key=lambda a: a["name"])
-    assert not jsondiff.diff(
-        raw_data,
-        {
-            "name": "TestPackage",
-            "version": "1.2.3",
-            "description": "This is Arduino library",
-            "sentence": "This is Arduino library",
-            "platforms": ["*"],
-            "frameworks": ["arduino"],
-            "export": {
-                "exclude": ["extras", "docs", "tests", "test", "*.doxyfile", "*.pdf"]
+    assert raw_data == {
+        "name": "TestPackage",
+        "version": "1.2.3",
+        "description": "This is Arduino library",
+        "sentence": "This is Arduino library",
+        "platforms": ["*"],
+        "frameworks": ["arduino"],
+        "export": {"exclude": LIBRARY_PROPERTIES_EXPORT_EXCLUDE},
+        "authors": [
+            {"name": "SomeAuthor", "email": "info@author.com"},
+            {"name": "Maintainer Author", "maintainer": True},
+        ],
+        "keywords": ["uncategorized"],
+        "customField": "Custom Value",
+        "depends": "First Library (=2.0.0), Second Library (>=1.2.0), Third",
+        "dependencies": [
+            {"name": "First Library", "version": "=2.0.0", "frameworks": ["arduino"]},
+            {
+                "name": "Second Library",
+                "version": ">=1.2.0",
+                "frameworks": ["arduino"],
             },
-            "authors": [
-                {"name": "SomeAuthor", "email": "info@author.com"},
-                {"name": "Maintainer Author", "maintainer": True},
-            ],
-            "keywords": ["uncategorized"],
-            "customField": "Custom Value",
-            "depends": "First Library (=2.0.0), Second Library (>=1.2.0), Third",
-            "dependencies": [
-                {
-                    "name": "First Library",
-                    "version": "=2.0.0",
-                    "frameworks": ["arduino"],
-                },
-                {
-                    "name": "Second Library",
-                    "version": ">=1.2.0",
-                    "frameworks": ["arduino"],
-                },
-                {"name": "Third", "frameworks": ["arduino"]},
-            ],
-        },
-    )
-
-    # Platforms ALL
-    data = parser.LibraryPropertiesManifestParser(
-        "architectures=*\n" + contents
-    ).as_dict()
-    assert data["platforms"] == ["*"]
-
-    # Platforms specific
-    data = parser.LibraryPropertiesManifestParser(
-        "architectures=avr, esp32\n" + contents
-    ).as_dict()
-    assert data["platforms"] == ["atmelavr", "espressif32"]
+            {"name": "Third", "frameworks": ["arduino"]},
+        ],
+    }
 
     # Remote URL
     data = parser.LibraryPropertiesManifestParser(
@@ -263,7 +238,7 @@ ignore_empty_field=
         ),
     ).as_dict()
     assert data["export"] == {
-        "exclude": ["extras", "docs", "tests", "test", "*.doxyfile", "*.pdf"],
+        "exclude": LIBRARY_PROPERTIES_EXPORT_EXCLUDE,
         "include": ["libraries/TestPackage"],
     }
     assert data["repository"] == {
@@ -291,6 +266,33 @@ maintainer=Rocket Scream Electronics
         {"name": "Rocket Scream Electronics", "maintainer": True}
     ]
 
+    # Author with unbalanced angle brackets
+    data = parser.LibraryPropertiesManifestParser(
+        "author=a>b <c@d.com>, Name <name@surname.com\n"
+    ).as_dict()
+    assert data["authors"] == [
+        {"name": "a>b", "email": "c@d.com"},
+        {"name": "Name <name@surname.com"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "architectures,expected",
+    [
+        (None, ["*"]),
+        ("*", ["*"]),
+        ("avr, esp32", ["atmelavr", "espressif32"]),
+        ("avr,samd", ["atmelavr", "atmelsam"]),
+        ("avr, unknown", ["atmelavr"]),
+    ],
+)
+def test_library_properties_platforms(architectures, expected):
+    contents = "name=TestPackage\nversion=1.0.0\n"
+    if architectures is not None:
+        contents += "architectures=%s\n" % architectures
+    data = parser.LibraryPropertiesManifestParser(contents).as_dict()
+    assert data["platforms"] == expected
+
 
 def test_library_json_schema():
     contents = """
@@ -348,49 +350,42 @@ def test_library_json_schema():
     assert data["examples"][1]["base"] == "examples/JsonHttpClient"
     assert data["examples"][1]["files"] == ["JsonHttpClient.ino"]
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "name": "ArduinoJson",
-            "keywords": ["json", "rest", "http", "web"],
-            "description": "An elegant and efficient JSON library for embedded systems",
-            "homepage": "https://arduinojson.org",
-            "repository": {
-                "url": "https://github.com/bblanchon/ArduinoJson.git",
-                "type": "git",
-            },
-            "version": "6.12.0",
-            "authors": [
-                {"name": "Benoit Blanchon", "url": "https://blog.benoitblanchon.fr"}
-            ],
-            "downloadUrl": "https://example.com/package.tar.gz",
-            "export": {"exclude": ["fuzzing", "scripts", "test", "third-party"]},
-            "frameworks": ["arduino"],
-            "platforms": ["*"],
-            "license": "MIT",
-            "examples": [
-                {
-                    "name": "JsonConfigFile",
-                    "base": "examples/JsonConfigFile",
-                    "files": ["JsonConfigFile.ino"],
-                },
-                {
-                    "name": "JsonHttpClient",
-                    "base": "examples/JsonHttpClient",
-                    "files": ["JsonHttpClient.ino"],
-                },
-            ],
-            "dependencies": [
-                {"name": "@owner/deps2", "version": "1.0.0", "frameworks": ["arduino"]},
-                {"name": "deps1", "version": "1.0.0"},
-                {
-                    "name": "deps3",
-                    "version": "1.0.0",
-                    "platforms": ["ststm32", "sifive"],
-                },
-            ],
+    assert data == {
+        "name": "ArduinoJson",
+        "keywords": ["json", "rest", "http", "web"],
+        "description": "An elegant and efficient JSON library for embedded systems",
+        "homepage": "https://arduinojson.org",
+        "repository": {
+            "url": "https://github.com/bblanchon/ArduinoJson.git",
+            "type": "git",
         },
-    )
+        "version": "6.12.0",
+        "authors": [
+            {"name": "Benoit Blanchon", "url": "https://blog.benoitblanchon.fr"}
+        ],
+        "downloadUrl": "https://example.com/package.tar.gz",
+        "export": {"exclude": ["fuzzing", "scripts", "test", "third-party"]},
+        "frameworks": ["arduino"],
+        "platforms": ["*"],
+        "license": "MIT",
+        "examples": [
+            {
+                "name": "JsonConfigFile",
+                "base": "examples/JsonConfigFile",
+                "files": ["JsonConfigFile.ino"],
+            },
+            {
+                "name": "JsonHttpClient",
+                "base": "examples/JsonHttpClient",
+                "files": ["JsonHttpClient.ino"],
+            },
+        ],
+        "dependencies": [
+            {"name": "@owner/deps2", "version": "1.0.0", "frameworks": ["arduino"]},
+            {"name": "deps1", "version": "1.0.0"},
+            {"name": "deps3", "version": "1.0.0", "platforms": ["ststm32", "sifive"]},
+        ],
+    }
 
     # legacy dependencies format
     contents = """
@@ -407,20 +402,17 @@ def test_library_json_schema():
 """
     raw_data = parser.LibraryJsonManifestParser(contents).as_dict()
     data = ManifestSchema().load_manifest(raw_data)
-    assert not jsondiff.diff(
-        data,
-        {
-            "name": "DallasTemperature",
-            "version": "3.8.0",
-            "dependencies": [
-                {
-                    "name": "OneWire",
-                    "authors": ["Paul Stoffregen"],
-                    "frameworks": ["arduino"],
-                }
-            ],
-        },
-    )
+    assert data == {
+        "name": "DallasTemperature",
+        "version": "3.8.0",
+        "dependencies": [
+            {
+                "name": "OneWire",
+                "authors": ["Paul Stoffregen"],
+                "frameworks": ["arduino"],
+            }
+        ],
+    }
 
 
 def test_library_properties_schema():
@@ -443,43 +435,31 @@ depends=First Library (=2.0.0), Second Library (>=1.2.0), Third
 
     data = ManifestSchema().load_manifest(raw_data)
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "description": (
-                "A library for monochrome TFTs and OLEDs. Supported display "
-                "controller: SSD1306, SSD1309, SSD1322, SSD1325"
-            ),
-            "repository": {
-                "url": "https://github.com/olikraus/u8glib.git",
-                "type": "git",
-            },
-            "frameworks": ["arduino"],
-            "platforms": ["atmelavr", "atmelsam"],
-            "version": "1.19.1",
-            "export": {
-                "exclude": ["extras", "docs", "tests", "test", "*.doxyfile", "*.pdf"]
+    assert data == {
+        "description": (
+            "A library for monochrome TFTs and OLEDs. Supported display "
+            "controller: SSD1306, SSD1309, SSD1322, SSD1325"
+        ),
+        "repository": {"url": "https://github.com/olikraus/u8glib.git", "type": "git"},
+        "frameworks": ["arduino"],
+        "platforms": ["atmelavr", "atmelsam"],
+        "version": "1.19.1",
+        "export": {"exclude": LIBRARY_PROPERTIES_EXPORT_EXCLUDE},
+        "authors": [
+            {"maintainer": True, "email": "olikraus@gmail.com", "name": "oliver"}
+        ],
+        "keywords": ["display"],
+        "name": "U8glib",
+        "dependencies": [
+            {"name": "First Library", "version": "=2.0.0", "frameworks": ["arduino"]},
+            {
+                "name": "Second Library",
+                "version": ">=1.2.0",
+                "frameworks": ["arduino"],
             },
-            "authors": [
-                {"maintainer": True, "email": "olikraus@gmail.com", "name": "oliver"}
-            ],
-            "keywords": ["display"],
-            "name": "U8glib",
-            "dependencies": [
-                {
-                    "name": "First Library",
-                    "version": "=2.0.0",
-                    "frameworks": ["arduino"],
-                },
-                {
-                    "name": "Second Library",
-                    "version": ">=1.2.0",
-                    "frameworks": ["arduino"],
-                },
-                {"name": "Third", "frameworks": ["arduino"]},
-            ],
-        },
-    )
+            {"name": "Third", "frameworks": ["arduino"]},
+        ],
+    }
 
     # Broken fields
     contents = """
@@ -512,36 +492,24 @@ includes=MozziGuts.h
 
     assert errors["authors"]
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "name": "Mozzi",
-            "version": "1.0.3",
-            "description": (
-                "Sound synthesis library for Arduino. With Mozzi, you can construct "
-                "sounds using familiar synthesis units like oscillators, delays, "
-                "filters and envelopes."
-            ),
-            "repository": {
-                "url": "https://github.com/sensorium/Mozzi.git",
-                "type": "git",
-            },
-            "platforms": ["*"],
-            "frameworks": ["arduino"],
-            "export": {
-                "exclude": ["extras", "docs", "tests", "test", "*.doxyfile", "*.pdf"]
-            },
-            "authors": [
-                {
-                    "maintainer": True,
-                    "email": "faveflave@gmail.com",
-                    "name": "Tim Barrass",
-                }
-            ],
-            "keywords": ["signal", "input", "output"],
-            "homepage": "https://sensorium.github.io/Mozzi/",
-        },
-    )
+    assert data == {
+        "name": "Mozzi",
+        "version": "1.0.3",
+        "description": (
+            "Sound synthesis library for Arduino. With Mozzi, you can construct "
+            "sounds using familiar synthesis units like oscillators, delays, "
+            "filters and envelopes."
+        ),
+        "repository": {"url": "https://github.com/sensorium/Mozzi.git", "type": "git"},
+        "platforms": ["*"],
+        "frameworks": ["arduino"],
+        "export": {"exclude": LIBRARY_PROPERTIES_EXPORT_EXCLUDE},
+        "authors": [
+            {"maintainer": True, "email": "faveflave@gmail.com", "name": "Tim Barrass"}
+        ],
+        "keywords": ["signal", "input", "output"],
+        "homepage": "https://sensorium.github.io/Mozzi/",
+    }
 
 
 def test_platform_json_schema():
@@ -597,34 +565,31 @@ def test_platform_json_schema():
 
     data = ManifestSchema().load_manifest(raw_data)
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "name": "atmelavr",
-            "title": "Atmel AVR",
-            "description": (
-                "Atmel AVR 8- and 32-bit MCUs deliver a unique combination of "
-                "performance, power efficiency and design flexibility. Optimized to "
-                "speed time to market-and easily adapt to new ones-they are based "
-                "on the industrys most code-efficient architecture for C and "
-                "assembly programming."
-            ),
-            "keywords": ["arduino", "atmel", "avr"],
-            "homepage": "http://www.atmel.com/products/microcontrollers/avr/default.aspx",
-            "license": "Apache-2.0",
-            "repository": {
-                "url": "https://github.com/platformio/platform-atmelavr.git",
-                "type": "git",
-            },
-            "frameworks": sorted(["arduino", "simba"]),
-            "version": "1.15.0",
-            "dependencies": [
-                {"name": "framework-arduinoavr", "version": "~4.2.0"},
-                {"name": "tool-avrdude", "version": "~1.60300.0"},
-                {"name": "toolchain-atmelavr", "version": "~1.50400.0"},
-            ],
+    assert data == {
+        "name": "atmelavr",
+        "title": "Atmel AVR",
+        "description": (
+            "Atmel AVR 8- and 32-bit MCUs deliver a unique combination of "
+            "performance, power efficiency and design flexibility. Optimized to "
+            "speed time to market-and easily adapt to new ones-they are based "
+            "on the industrys most code-efficient architecture for C and "
+            "assembly programming."
+        ),
+        "keywords": ["arduino", "atmel", "avr"],
+        "homepage": "http://www.atmel.com/products/microcontrollers/avr/default.aspx",
+        "license": "Apache-2.0",
+        "repository": {
+            "url": "https://github.com/platformio/platform-atmelavr.git",
+            "type": "git",
         },
-    )
+        "frameworks": sorted(["arduino", "simba"]),
+        "version": "1.15.0",
+        "dependencies": [
+            {"name": "framework-arduinoavr", "version": "~4.2.0"},
+            {"name": "tool-avrdude", "version": "~1.60300.0"},
+            {"name": "toolchain-atmelavr", "version": "~1.50400.0"},
+        ],
+    }
 
 
 def test_package_json_schema():
@@ -644,32 +609,92 @@ def test_package_json_schema():
 
     data = ManifestSchema().load_manifest(raw_data)
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "name": "tool-scons",
-            "description": "SCons software construction tool",
-            "keywords": ["scons", "build"],
-            "homepage": "http://www.scons.org",
-            "system": ["linux_armv6l", "linux_armv7l", "linux_armv8l"],
-            "version": "3.30101.0",
-        },
-    )
+    assert data == {
+        "name": "tool-scons",
+        "description": "SCons software construction tool",
+        "keywords": ["scons", "build"],
+        "homepage": "http://www.scons.org",
+        "system": ["linux_armv6l", "linux_armv7l", "linux_armv8l"],
+        "version": "3.30101.0",
+    }
 
-    mp = parser.ManifestParserFactory.new(
-        '{"system": "*"}', parser.ManifestFileType.PACKAGE_JSON
-    )
-    assert "system" not in mp.as_dict()
 
+@pytest.mark.parametrize(
+    "system,expected",
+    [
+        ('"*"', None),
+        ('["*"]', None),
+        ('"all"', None),
+        ('"darwin_x86_64"', ["darwin_x86_64"]),
+        ('["Linux_x86_64", "windows_amd64"]', ["linux_x86_64", "windows_amd64"]),
+    ],
+)
+def test_package_json_system(system, expected):
     mp = parser.ManifestParserFactory.new(
-        '{"system": "all"}', parser.ManifestFileType.PACKAGE_JSON
+        '{"system": %s}' % system, parser.ManifestFileType.PACKAGE_JSON
     )
-    assert "system" not in mp.as_dict()
+    assert mp.as_dict().get("system") == expected
 
-    mp = parser.ManifestParserFactory.new(
-        '{"system": "darwin_x86_64"}', parser.ManifestFileType.PACKAGE_JSON
+
+def test_parser_unknown_type():
+    with pytest.raises(parser.UnknownManifestError):
+        parser.ManifestParserFactory.new('{"name": "pkg"}', "unknown.json")
+
+
+def test_parser_cache(monkeypatch):
+    monkeypatch.setattr(parser.BaseManifestParser, "_parsed_cache", OrderedDict())
+    calls = []
+    parse = parser.LibraryJsonManifestParser.parse
+
+    def _parse(self, contents):
+        calls.append(contents)
+        return parse(self, contents)
+
+    monkeypatch.setattr(parser.LibraryJsonManifestParser, "parse", _parse)
+
+    contents = '{"name": "TestPackage", "keywords": "kw1, kw2", "version": "1.0.0"}'
+    data = parser.ManifestParserFactory.new(
+        contents, parser.ManifestFileType.LIBRARY_JSON
+    ).as_dict()
+    data["keywords"].append("kw3")
+    data["name"] = "Modified"
+
+    data = parser.ManifestParserFactory.new(
+        contents, parser.ManifestFileType.LIBRARY_JSON
+    ).as_dict()
+    assert data == {
+        "name": "TestPackage",
+        "keywords": ["kw1", "kw2"],
+        "version": "1.0.0",
+    }
+    assert calls == [contents]
+
+    # the same contents of a different manifest type
+    data = parser.ManifestParserFactory.new(
+        contents, parser.ManifestFileType.PACKAGE_JSON
+    ).as_dict()
+    assert data["keywords"] == ["kw1", "kw2"]
+
+    # a subclass with the same manifest type does not share cached data
+    class CustomParser(parser.LibraryJsonManifestParser):
+        def parse(self, contents):
+            data = super(CustomParser, self).parse(contents)
+            data["name"] = "Custom"
+            return data
+
+    assert CustomParser(contents).as_dict()["name"] == "Custom"
+    assert parser.LibraryJsonManifestParser(contents).as_dict()["name"] == (
+        "TestPackage"
     )
-    assert mp.as_dict()["system"] == ["darwin_x86_64"]
+    assert calls == [contents, contents]
+
+    # the least recently used manifest is evicted first
+    monkeypatch.setattr(parser.BaseManifestParser, "PARSED_CACHE_SIZE", 2)
+    monkeypatch.setattr(parser.BaseManifestParser, "_parsed_cache", OrderedDict())
+    del calls[:]
+    for name in ("a", "b", "a", "c", "a", "b"):
+        parser.LibraryJsonManifestParser('{"name": "%s"}' % name)
+    assert calls == ['{"name": "%s"}' % name for name in ("a", "b", "c", "b")]
 
 
 def test_parser_from_dir(tmpdir_factory):
@@ -749,57 +774,54 @@ def test_examples_from_dir(tmpdir_factory):
 
     data = ManifestSchema().load_manifest(raw_data)
 
-    assert not jsondiff.diff(
-        data,
-        {
-            "version": "1.0.0",
-            "name": "pkg",
-            "examples": _sort_examples(
-                [
-                    {
-                        "name": "PlatformIO/hello",
-                        "base": os.path.join("examples", "PlatformIO", "hello"),
-                        "files": [
-                            "platformio.ini",
-                            os.path.join("include", "main.h"),
-                            os.path.join("src", "main.cpp"),
-                        ],
-                    },
-                    {
-                        "name": "1_General/SomeSketchIno",
-                        "base": os.path.join("examples", "1. General", "SomeSketchIno"),
-                        "files": ["SomeSketchIno.ino"],
-                    },
-                    {
-                        "name": "1_General/SomeSketchPde",
-                        "base": os.path.join("examples", "1. General", "SomeSketchPde"),
-                        "files": ["SomeSketchPde.pde"],
-                    },
-                    {
-                        "name": "demo",
-                        "base": os.path.join("examples", "demo"),
-                        "files": ["demo.h", "util.h", "demo.cpp"],
-                    },
-                    {
-                        "name": "world",
-                        "base": "examples/world",
-                        "files": [
-                            "platformio.ini",
-                            os.path.join("include", "world.h"),
-                            os.path.join("src", "world.c"),
-                            "README",
-                            "extra.py",
-                        ],
-                    },
-                    {
-                        "name": "Examples",
-                        "base": "examples",
-                        "files": ["root.c", "root.h"],
-                    },
-                ]
-            ),
-        },
-    )
+    assert data == {
+        "version": "1.0.0",
+        "name": "pkg",
+        "examples": _sort_examples(
+            [
+                {
+                    "name": "PlatformIO/hello",
+                    "base": os.path.join("examples", "PlatformIO", "hello"),
+                    "files": [
+                        "platformio.ini",
+                        os.path.join("include", "main.h"),
+                        os.path.join("src", "main.cpp"),
+                    ],
+                },
+                {
+                    "name": "1_General/SomeSketchIno",
+                    "base": os.path.join("examples", "1. General", "SomeSketchIno"),
+                    "files": ["SomeSketchIno.ino"],
+                },
+                {
+                    "name": "1_General/SomeSketchPde",
+                    "base": os.path.join("examples", "1. General", "SomeSketchPde"),
+                    "files": ["SomeSketchPde.pde"],
+                },
+                {
+                    "name": "demo",
+                    "base": os.path.join("examples", "demo"),
+                    "files": ["demo.h", "util.h", "demo.cpp"],
+                },
+                {
+                    "name": "world",
+                    "base": "examples/world",
+                    "files": [
+                        "platformio.ini",
+                        os.path.join("include", "world.h"),
+                        os.path.join("src", "world.c"),
+                        "README",
+                        "extra.py",
+                    ],
+                },
+                {
+                    "name": "Examples",
+                    "base": "examples",
+                    "files": ["root.c", "root.h"],
+                },
+            ]
+        ),
+    }
 
 
 def test_parser_from_archive(tmpdir_factory):
@@ -817,6 +839,30 @@ def test_parser_from_archive(tmpdir_factory):
     assert data["name"] == "library.json"
 
 
+@pytest.mark.parametrize(
+    "version,valid",
+    [
+        ("1.2.3", True),
+        ("3.30101.0", True),
+        ("1.2", True),
+        ("1.2.3-beta.1", True),
+        ("1.2.3+build.5", True),
+        ("broken_version", False),
+        ("1..3", False),
+        ("a.b.c", False),
+    ],
+)
+def test_schema_version(version, valid):
+    manifest = dict(name="MyPackage", version=version)
+    if valid:
+        assert ManifestSchema().load_manifest(manifest)["version"] == version
+    else:
+        with pytest.raises(
+            ManifestValidationError, match="Invalid semantic versioning format"
+        ):
+            ManifestSchema().load_manifest(manifest)
+
+
 def test_broken_schemas():
     # missing required field
     with pytest.raises(
@@ -31,6 +31,8 @@ def test_id():
 def test_name():
     assert PackageSpec("foo") == PackageSpec(name="foo")
     assert PackageSpec(" bar-24 ") == PackageSpec(name="bar-24")
+    assert PackageSpec("foo") != PackageSpec(name="bar")
+    assert PackageSpec("foo") != "foo"
 
 
 def test_requirements():